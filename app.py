@@ -1,11 +1,27 @@
 import os
-import json
 import re
 import asyncio
-from typing import List
-from fastapi import FastAPI, Query
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode
+from typing import (
+    Annotated,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Literal,
+)
+import aiohttp
+import orjson
+from cachetools import TTLCache
+from fastapi import Body, FastAPI, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from dotenv import load_dotenv
+from selectolax.lexbor import LexborHTMLParser
 from crawl4ai import (
     AsyncWebCrawler,
     BrowserConfig,
@@ -14,6 +30,23 @@ from crawl4ai import (
     CacheMode,
 )
 
+load_dotenv()
+
+_RATING_RE = re.compile(r"(\d+\.?\d*)")
+_COUNT_RE = re.compile(r"(\d+)")
+_COUNTRY_PREFIX = "Country of Origin:"
+# Text found in a general-details row label -> field its value belongs to
+_GENERAL_DETAIL_FIELDS = {
+    "Alcohol": "alcohol_content",
+    "Region": "region",
+    "Grape": "grape_variety",
+}
+# Product links are site-relative paths. Anything that doesn't start with a
+# single "/" (e.g. "@evil.com/" or "//evil.com/") would change the host once
+# appended to the Waitrose origin
+_PRODUCT_LINK_PATTERN = r"^/([^/\\].*)?$"
+_PRODUCT_LINK_RE = re.compile(_PRODUCT_LINK_PATTERN)
+
 
 # ---------------------------
 # Pydantic schema for product
@@ -49,17 +82,15 @@ class WaitroseWineDetail(BaseModel):
     @field_validator("country")
     @classmethod
     def clean_country(cls, v):
-        if v:
-            # Remove "Country of Origin:" prefix
-            return v.replace("Country of Origin:", "").strip()
-        return v
+        # Remove "Country of Origin:" prefix
+        return v.removeprefix(_COUNTRY_PREFIX).strip() if v else v
 
     @field_validator("rating")
     @classmethod
     def clean_rating(cls, v):
         if v:
             # Extract just the number from "4.5 out of 5 stars" or "4out of 5 stars"
-            match = re.search(r"(\d+\.?\d*)", v)
+            match = _RATING_RE.search(v)
             return match.group(1) if match else v
         return v
 
@@ -68,10 +99,41 @@ class WaitroseWineDetail(BaseModel):
     def clean_review_count(cls, v):
         if v:
             # Extract just the number from "37 reviews"
-            match = re.search(r"(\d+)", v)
+            match = _COUNT_RE.search(v)
             return match.group(1) if match else v
         return v
 
+    @classmethod
+    def from_raw(cls, data: dict) -> "WaitroseWineDetail":
+        """Build from a trusted CSS-extracted row, skipping full validation.
+
+        Calls the cleanup validators above directly instead of going through
+        pydantic's validation machinery.
+        """
+        cleaned = dict(data)
+        for row in cleaned.pop("general_details", None) or []:
+            label, value = row.get("label", ""), row.get("value")
+            for needle, name in _GENERAL_DETAIL_FIELDS.items():
+                if needle in label and not cleaned.get(name):
+                    cleaned[name] = value
+        cleaned["country"] = cls.clean_country(cleaned.get("country"))
+        cleaned["rating"] = cls.clean_rating(cleaned.get("rating"))
+        cleaned["review_count"] = cls.clean_review_count(cleaned.get("review_count"))
+        return cls.model_construct(**cleaned)
+
+
+def _has_required(model: type[BaseModel], row: dict) -> bool:
+    """Whether a CSS-extracted row has every field model_construct can't default.
+
+    crawl4ai leaves out fields whose selector didn't match, and model_construct
+    would happily build an instance without them.
+    """
+    return all(
+        row.get(name) is not None
+        for name, field in model.model_fields.items()
+        if field.is_required()
+    )
+
 
 # ---------------------------
 # CSS extraction schema
@@ -143,9 +205,19 @@ schema_details = {
             "type": "text",
         },
         {
-            "name": "alcohol_content",
-            "selector": "p.GeneralDetails_label__4obdI:contains('Alcohol') span.GeneralDetails_value__j1woc",
-            "type": "text",
+            # Labelled rows (alcohol, region, grape, ...) are collected in one
+            # pass and mapped to fields by WaitroseWineDetail.from_raw
+            "name": "general_details",
+            "selector": "p.GeneralDetails_label__4obdI",
+            "type": "list",
+            "fields": [
+                {"name": "label", "type": "text"},
+                {
+                    "name": "value",
+                    "selector": "span.GeneralDetails_value__j1woc",
+                    "type": "text",
+                },
+            ],
         },
         {
             "name": "rating",
@@ -162,16 +234,6 @@ schema_details = {
             "selector": "span[class*='wasPrice'], span[class*='WasPrice']",
             "type": "text",
         },
-        {
-            "name": "region",
-            "selector": "p.GeneralDetails_label__4obdI:contains('Region') span.GeneralDetails_value__j1woc",
-            "type": "text",
-        },
-        {
-            "name": "grape_variety",
-            "selector": "p.GeneralDetails_label__4obdI:contains('Grape') span.GeneralDetails_value__j1woc",
-            "type": "text",
-        },
         {
             "name": "stock_status",
             "selector": "span[class*='stock'], div[class*='availability']",
@@ -191,147 +253,544 @@ schema_details = {
 }
 
 
+# Extraction strategies and page scripts are stateless, so build them once
+CSS_STRATEGY_LISTING = JsonCssExtractionStrategy(schema)
+CSS_STRATEGY_DETAIL = JsonCssExtractionStrategy(schema_details)
+
+# JavaScript to expand all accordion sections to reveal hidden content. crawl4ai
+# runs js_code as an async function body right after DOMContentLoaded, so wait
+# (briefly) for the product to render before looking for the buttons
+_EXPAND_ACCORDIONS_JS = """
+const deadline = Date.now() + 5000;
+while (!document.querySelector("span.ProductHeader_name__ABMK2") && Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, 100));
+}
+const buttons = document.querySelectorAll('button[aria-expanded="false"]');
+buttons.forEach(btn => btn.click());
+return {expanded: buttons.length};
+"""
+
+# Detail pages are ready once the header has rendered. Origin and the expanded
+# tasting-notes accordion are waited for too, but only for a short grace
+# period since not every product has them
+_DETAILS_READY_JS = """js:() => {
+    window.__waitStart ??= Date.now();
+    if (!document.querySelector("span.ProductHeader_name__ABMK2")) return false;
+    const complete = !!document.querySelector("li.GeneralDetails_origin__a45Oz")
+        && !!document.querySelector("div.swat-hosted-summary-text");
+    return complete || Date.now() - window.__waitStart > 2000;
+}"""
+
+# Run on each listing page to report whether more pages follow. crawl4ai wraps
+# js_code in an async function body, so the value must be returned explicitly;
+# it is wrapped in an object because crawl4ai replaces falsy returns with
+# {"success": True}
+_HAS_LOAD_MORE_JS = """
+return {
+    has_more: !!document.querySelector('button[data-testid="button-load-more"]'),
+};
+"""
+
+# Run configs don't depend on the request either. Each page is a single
+# navigation, so there is no session to bind; crawl4ai opens and closes its own
+# tab per arun. Its disk cache never expires, so it is bypassed and the TTL
+# caches are authoritative
+CRAWL_CONFIG_LISTING = CrawlerRunConfig(
+    js_only=False,
+    js_code=_HAS_LOAD_MORE_JS,
+    extraction_strategy=CSS_STRATEGY_LISTING,
+    css_selector="article[data-testid='product-pod']",
+    cache_mode=CacheMode.BYPASS,
+)
+CRAWL_CONFIG_DETAIL = CrawlerRunConfig(
+    js_only=False,
+    js_code=_EXPAND_ACCORDIONS_JS,
+    extraction_strategy=CSS_STRATEGY_DETAIL,
+    cache_mode=CacheMode.BYPASS,
+    wait_for=_DETAILS_READY_JS,
+    wait_for_timeout=10_000,
+)
+
+PAGE_SIZE = 24  # products per Waitrose listing page
+MAX_PAGES = 10  # upper bound on max_pages accepted by the listing endpoints
+MAX_BATCH_LINKS = 50  # upper bound on links per /scrape-details-batch request
+
+
+# ---------------------------
+# Shared browser pool
+# ---------------------------
+# The viewport stays desktop-sized because Waitrose serves a different layout
+# (and different class names) to narrow screens. crawl4ai's text_mode is not
+# used: it also disables JavaScript, which the pods and accordions need.
+# Extraction only reads image URLs from src attributes, so images are turned
+# off in Blink instead; request routing would also disable the HTTP cache that
+# lets pooled browsers reuse the site's JS and CSS bundles
+BROWSER_CONFIG = BrowserConfig(
+    headless=True,
+    viewport_width=1280,
+    viewport_height=800,
+    verbose=False,
+    extra_args=["--blink-settings=imagesEnabled=false"],
+)
+
+
+class CrawlerPool:
+    """Keeps started browsers alive between requests instead of launching one per call.
+
+    Up to ``max_size`` idle crawlers are kept warm; under load the pool bursts to
+    ``burst_limit`` crawlers and closes the extras once they are released.
+    """
+
+    def __init__(self, config: BrowserConfig, max_size: int = 4, burst_limit: int = 8):
+        self.config = config
+        self.max_size = max_size
+        self._idle: List[AsyncWebCrawler] = []
+        self._slots = asyncio.BoundedSemaphore(burst_limit)
+
+    async def _create(self) -> AsyncWebCrawler:
+        crawler = AsyncWebCrawler(config=self.config)
+        await crawler.__aenter__()
+        return crawler
+
+    async def _close(self, crawler: AsyncWebCrawler) -> None:
+        try:
+            await crawler.__aexit__(None, None, None)
+        except Exception as e:
+            # A crashed browser can fail to shut down cleanly; it is discarded anyway
+            print(f"Error closing crawler: {e}")
+
+    @staticmethod
+    def _is_alive(crawler: AsyncWebCrawler) -> bool:
+        browser = crawler.crawler_strategy.browser_manager.browser
+        return crawler.ready and browser is not None and browser.is_connected()
+
+    async def _take(self) -> AsyncWebCrawler:
+        while self._idle:
+            crawler = self._idle.pop()
+            if self._is_alive(crawler):
+                return crawler
+            await self._close(crawler)
+        return await self._create()
+
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncIterator[AsyncWebCrawler]:
+        async with self._slots:
+            crawler = await self._take()
+            try:
+                yield crawler
+            finally:
+                # A failed page or a disconnected client leaves the browser
+                # usable; only a crashed one is discarded
+                if len(self._idle) < self.max_size and self._is_alive(crawler):
+                    self._idle.append(crawler)
+                else:
+                    await self._close(crawler)
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._close(self._idle.pop())
+
+
+# Browsers are only launched on first use, so this is safe at import time
+crawler_pool = CrawlerPool(BROWSER_CONFIG, max_size=4, burst_limit=8)
+
+# Caps in-flight page loads against Waitrose across all requests and endpoints,
+# so concurrent pagination and batch crawls don't trip its rate limiting
+WAITROSE_SEM = asyncio.BoundedSemaphore(int(os.getenv("WAITROSE_CONCURRENCY", "6")))
+
+
 # ---------------------------
 # Scraper functions
 # ---------------------------
-async def scrape_waitrose(
-    search_term: str, max_pages: int = 5
-) -> List[WaitroseProduct]:
-    """Scrape Waitrose product listing pages"""
-    url = f"https://www.waitrose.com/ecom/shop/search?&searchTerm={search_term}"
+def _has_load_more(result) -> bool:
+    # Read the _HAS_LOAD_MORE_JS sentinel; only if the script didn't run or
+    # failed, fall back to scanning the raw HTML
+    runs = (getattr(result, "js_execution_result", None) or {}).get("results")
+    run = runs[0] if runs else None
+    if isinstance(run, dict) and "has_more" in run:
+        return bool(run["has_more"])
+    return "button-load-more" in result.html
 
-    load_dotenv()
 
-    browser_config = BrowserConfig(
-        headless=True,
-        viewport_width=1280,
-        viewport_height=800,
-        verbose=False,
-    )
-    css_strategy = JsonCssExtractionStrategy(schema)
+def _listing_url(search_term: str, start: int) -> str:
+    query = urlencode({"searchTerm": search_term, "start": start})
+    return f"https://www.waitrose.com/ecom/shop/search?{query}"
 
-    products: List[WaitroseProduct] = []
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        for page in range(max_pages):
-            load_more_js = """
-                () => {
-                    const btn = document.querySelector('button[data-testid="button-load-more"]');
-                    if (btn) { btn.click(); return true; }
-                    return false;
-                }
-            """
-
-            wait_for_code = f"""
-                () => {{
-                    return document.querySelectorAll('article[data-testid="product-pod"]').length > {len(products)};
-                }}
-            """
-
-            crawler_config = CrawlerRunConfig(
-                js_only=True if page > 0 else False,
-                js_code=load_more_js if page > 0 else None,
-                extraction_strategy=css_strategy,
-                css_selector="article[data-testid='product-pod']",
-                session_id="waitrose_session",
-                wait_for=wait_for_code if page > 0 else None,
-                cache_mode=CacheMode.BYPASS,
-            )
+async def _fetch_page(crawler: AsyncWebCrawler, url: str) -> tuple[list, bool]:
+    """Crawl a single listing page, returning its raw rows and whether more follow"""
+    async with WAITROSE_SEM:
+        result = await crawler.arun(url=url, config=CRAWL_CONFIG_LISTING)
 
-            result = await crawler.arun(url=url, config=crawler_config)
-            if result.success:
-                batch = json.loads(result.extracted_content)
+    if not result.success:
+        raise RuntimeError(f"Crawl failed for {url}: {result.error_message}")
+    batch = orjson.loads(result.extracted_content)
+    return batch, _has_load_more(result)
+
+
+async def scrape_waitrose_iter(
+    search_term: str, max_pages: int = 5
+) -> AsyncIterator[List[WaitroseProduct]]:
+    """Yield Waitrose listing results one page at a time, in page order
+
+    Pages are crawled concurrently; each batch is yielded as soon as it and all
+    earlier pages have finished. Raises if a page fails to crawl, so a truncated
+    listing is never mistaken for a complete one.
+    """
+    async with crawler_pool.get_connection() as crawler:
+        # Pages are independent URLs, so crawl them concurrently (bounded by
+        # WAITROSE_SEM so we don't hammer Waitrose with max_pages tabs at once)
+        tasks = [
+            asyncio.ensure_future(
+                _fetch_page(crawler, _listing_url(search_term, start))
+            )
+            for start in range(0, max_pages * PAGE_SIZE, PAGE_SIZE)
+        ]
+        try:
+            # Stop at the first empty page or the last one that still offered
+            # "load more"; anything after it would be past the end
+            for task in tasks:
+                batch, has_more = await task
                 if not batch:
                     break
-                products.extend([WaitroseProduct(**p) for p in batch])
-
-                if "button-load-more" not in result.html:
+                yield [
+                    WaitroseProduct.model_construct(**p)
+                    for p in batch
+                    if _has_required(WaitroseProduct, p)
+                ]
+                if not has_more:
                     break
-            else:
-                break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
 
+async def scrape_waitrose(
+    search_term: str, max_pages: int = 5
+) -> List[WaitroseProduct]:
+    """Scrape Waitrose product listing pages"""
+    products: List[WaitroseProduct] = []
+    async for batch in scrape_waitrose_iter(search_term, max_pages):
+        products.extend(batch)
     return products
 
 
-async def scrape_waitrose_details(link: str) -> List[WaitroseWineDetail]:
-    """Scrape individual Waitrose product detail page"""
-    url = f"https://www.waitrose.com{link}"
+def _product_url(link: str) -> str:
+    """Absolute URL for a product link, refusing links that leave waitrose.com"""
+    if not _PRODUCT_LINK_RE.match(link):
+        raise ValueError(f"Invalid product link: {link!r}")
+    return f"https://www.waitrose.com{link}"
 
-    load_dotenv()
 
-    browser_config = BrowserConfig(
-        headless=True,
-        viewport_width=1280,
-        viewport_height=800,
-        verbose=False,
-        # page_timeout=60000,  # 60 seconds timeout
-        # delay_before_return=5.0,  # Increased wait time for dynamic content
-    )
-    css_strategy = JsonCssExtractionStrategy(schema_details)
+async def _scrape_one(crawler: AsyncWebCrawler, link: str) -> List[WaitroseWineDetail]:
+    """Scrape one product detail page using an already-started crawler"""
+    url = _product_url(link)
 
     product_details: List[WaitroseWineDetail] = []
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        # JavaScript to expand all accordion sections to reveal hidden content
-        expand_accordions_js = """
-        () => {
-            const buttons = document.querySelectorAll('button[aria-expanded="false"]');
-            buttons.forEach(btn => btn.click());
-            return true;
-        }
-        """
-
-        crawler_config = CrawlerRunConfig(
-            js_only=False,
-            js_code=expand_accordions_js,
-            extraction_strategy=css_strategy,
-            cache_mode=CacheMode.BYPASS,
-            wait_for="h1",
-            delay_before_return_html=3.0,
+    async with WAITROSE_SEM:
+        result = await crawler.arun(url=url, config=CRAWL_CONFIG_DETAIL)
+
+    if result.success:
+        try:
+            data = orjson.loads(result.extracted_content)
+            if data:
+                rows = data if isinstance(data, list) else [data]
+                product_details.extend(
+                    WaitroseWineDetail.from_raw(p)
+                    for p in rows
+                    if _has_required(WaitroseWineDetail, p)
+                )
+        except orjson.JSONDecodeError as e:
+            print(f"JSON decode error: {e}")
+            print(f"Raw content: {result.extracted_content}")
+        except Exception as e:
+            print(f"Error creating WaitroseWineDetail: {e}")
+            print(f"Data: {data}")
+    else:
+        print(
+            f"Crawl failed: {result.error_message if hasattr(result, 'error_message') else 'Unknown error'}"
         )
 
-        result = await crawler.arun(url=url, config=crawler_config)
-        if result.success:
-            try:
-                data = json.loads(result.extracted_content)
-                if data:
-                    if isinstance(data, list):
-                        product_details.extend([WaitroseWineDetail(**p) for p in data])
-                    else:
-                        product_details.append(WaitroseWineDetail(**data))
-            except json.JSONDecodeError as e:
-                print(f"JSON decode error: {e}")
-                print(f"Raw content: {result.extracted_content}")
-            except Exception as e:
-                print(f"Error creating WaitroseWineDetail: {e}")
-                print(f"Data: {data}")
+    return product_details
+
+
+# ---------------------------
+# Browserless fast path
+# ---------------------------
+# Fields that must be in the server-rendered HTML for the fast path to be used;
+# anything else (e.g. accordion-only tasting notes) is best-effort
+FAST_REQUIRED_FIELDS = ("product_name", "price", "country", "rating")
+
+_http_session: aiohttp.ClientSession | None = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    # Created lazily because a ClientSession must be built inside the event loop
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50),
+            timeout=aiohttp.ClientTimeout(total=15),
+            headers={
+                "User-Agent": (
+                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+                )
+            },
+        )
+    return _http_session
+
+
+def _parse_details_html(html: str) -> dict:
+    """Apply schema_details to static HTML with selectolax"""
+    tree = LexborHTMLParser(html)
+    base = tree.css_first(schema_details["baseSelector"])
+    if base is None:
+        return {}
+
+    return _extract_fields(base, schema_details["fields"])
+
+
+def _extract_fields(node, fields: list) -> dict:
+    # Mirrors crawl4ai's text/attribute/list field types; a field without a
+    # selector reads from the node itself
+    data = {}
+    for field in fields:
+        if field["type"] == "list":
+            data[field["name"]] = [
+                _extract_fields(item, field["fields"])
+                for item in node.css(field["selector"])
+            ]
+            continue
+        target = node.css_first(field["selector"]) if "selector" in field else node
+        if target is None:
+            continue
+        if field["type"] == "attribute":
+            value = target.attributes.get(field["attribute"])
         else:
-            print(
-                f"Crawl failed: {result.error_message if hasattr(result, 'error_message') else 'Unknown error'}"
-            )
+            value = target.text(strip=True)
+        if value:
+            data[field["name"]] = value
+    return data
+
+
+async def _fast_fetch(link: str) -> WaitroseWineDetail | None:
+    """Fetch a detail page over plain HTTP, or None if it needs a browser"""
+    url = _product_url(link)
+    try:
+        async with WAITROSE_SEM, _get_http_session().get(url) as response:
+            if response.status != 200:
+                return None
+            html = await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Fast fetch failed: {e}")
+        return None
+
+    data = _parse_details_html(html)
+    if not all(data.get(name) for name in FAST_REQUIRED_FIELDS):
+        return None
+    return WaitroseWineDetail.from_raw(data)
+
+
+async def scrape_waitrose_details(
+    link: str, mode: Literal["fast", "full"] = "full"
+) -> List[WaitroseWineDetail]:
+    """Scrape individual Waitrose product detail page
+
+    With ``mode="fast"``
+    the page is first fetched without a browser, falling back to a full crawl
+    when the key fields are not in the server-rendered HTML.
+    """
+    if mode == "fast":
+        detail = await _fast_fetch(link)
+        if detail is not None:
+            return [detail]
+
+    async with crawler_pool.get_connection() as crawler:
+        return await _scrape_one(crawler, link)
 
-    return product_details
+
+# ---------------------------
+# Result caches
+# ---------------------------
+# Waitrose listings change on the order of hours, so identical queries within
+# the TTL are served from memory instead of re-crawling
+_listing_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+_detail_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)  # keyed by (link, mode)
+_inflight: dict[tuple[int, Hashable], asyncio.Future] = {}
+
+
+async def _cached(
+    cache: TTLCache,
+    key: Hashable,
+    fetch: Callable[[], Awaitable[list]],
+    refresh: bool = False,
+) -> list:
+    """Return cache[key], running fetch() at most once at a time per key.
+
+    Concurrent callers for the same key share the in-flight crawl's outcome,
+    including an empty result or an exception, rather than starting their own;
+    only a later call retries a failed key. Empty results are not cached.
+    ``refresh`` drops any cached value first.
+    """
+    if refresh:
+        cache.pop(key, None)
+    flight = (id(cache), key)
+    while True:
+        if key in cache:
+            return cache[key]
+        future = _inflight.get(flight)
+        if future is None:
+            break
+        # asyncio.wait doesn't cancel the shared future if this caller is cancelled
+        await asyncio.wait([future])
+        if not future.cancelled():
+            return future.result()
+        # The caller running the crawl was cancelled; take over from it
+
+    future = _inflight[flight] = asyncio.get_running_loop().create_future()
+    try:
+        value = await fetch()
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved in case nobody was waiting
+        raise
+    else:
+        if value:
+            cache[key] = value
+        future.set_result(value)
+        return value
+    finally:
+        if not future.done():
+            future.cancel()
+        del _inflight[flight]
 
 
 # ---------------------------
 # FastAPI app
 # ---------------------------
-app = FastAPI(title="Waitrose Scraper API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await crawler_pool.close()
+    if _http_session is not None:
+        await _http_session.close()
+
+
+app = FastAPI(
+    title="Waitrose Scraper API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+# Detail payloads carry long free-text fields that compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 @app.get("/scrape", response_model=List[WaitroseProduct])
-async def scrape(searchTerm: str = Query(..., description="Search term (e.g. 'wine')")):
+async def scrape(
+    searchTerm: str = Query(..., description="Search term (e.g. 'wine')"),
+    max_pages: int = Query(
+        5, ge=1, le=MAX_PAGES, description="Number of listing pages to crawl"
+    ),
+    fresh: bool = Query(False, description="Bypass the cache and crawl live"),
+):
     """Scrape Waitrose product listing pages"""
-    products = await scrape_waitrose(searchTerm)
+    try:
+        products = await _cached(
+            _listing_cache,
+            (searchTerm, max_pages),
+            lambda: scrape_waitrose(searchTerm, max_pages=max_pages),
+            refresh=fresh,
+        )
+    except Exception as e:
+        print(f"Listing crawl failed: {e}")
+        raise HTTPException(status_code=502, detail="Waitrose listing crawl failed")
     return products
 
 
+@app.get("/scrape-stream")
+async def scrape_stream(
+    searchTerm: str = Query(..., description="Search term (e.g. 'wine')"),
+    max_pages: int = Query(
+        5, ge=1, le=MAX_PAGES, description="Number of listing pages to crawl"
+    ),
+):
+    """Stream Waitrose listing results as NDJSON, one line per page"""
+
+    async def gen():
+        async for batch in scrape_waitrose_iter(searchTerm, max_pages):
+            yield orjson.dumps([p.model_dump() for p in batch]) + b"\n"
+
+    # An explicit Content-Encoding makes GZipMiddleware pass the stream through,
+    # so each page reaches the client as soon as it is written
+    return StreamingResponse(
+        gen(),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "identity"},
+    )
+
+
 @app.get("/scrape-details", response_model=List[WaitroseWineDetail])
 async def scrape_details(
-    link: str = Query(..., description="Product link (e.g. '/ecom/products/...')")
+    link: str = Query(
+        ...,
+        pattern=_PRODUCT_LINK_PATTERN,
+        description="Product link (e.g. '/ecom/products/...')",
+    ),
+    fresh: bool = Query(False, description="Bypass the cache and crawl live"),
+    mode: Literal["fast", "full"] = Query(
+        "full", description="'fast' tries a browserless fetch before crawling"
+    ),
 ):
     """Scrape individual Waitrose product detail page"""
-    product_details = await scrape_waitrose_details(link)
+    product_details = await _cached(
+        _detail_cache,
+        (link, mode),
+        lambda: scrape_waitrose_details(link, mode=mode),
+        refresh=fresh,
+    )
+    return product_details
+
+
+@app.post("/scrape-details-batch", response_model=Dict[str, List[WaitroseWineDetail]])
+async def scrape_details_batch(
+    links: List[Annotated[str, Field(pattern=_PRODUCT_LINK_PATTERN)]] = Body(
+        ...,
+        max_length=MAX_BATCH_LINKS,
+        description="Product links to scrape",
+    ),
+    fresh: bool = Query(False, description="Bypass the cache and crawl live"),
+):
+    """Scrape many Waitrose product detail pages in one request
+
+    All links share one browser and are crawled concurrently, bounded by
+    WAITROSE_SEM. The response maps each distinct link to its details; links
+    that failed map to an empty list.
+    """
+    async with crawler_pool.get_connection() as crawler:
+
+        async def _one(link: str) -> List[WaitroseWineDetail]:
+            return await _cached(
+                _detail_cache,
+                (link, "full"),
+                lambda: _scrape_one(crawler, link),
+                refresh=fresh,
+            )
+
+        # Crawl each distinct link once
+        unique_links = list(dict.fromkeys(links))
+        results = await asyncio.gather(
+            *[_one(link) for link in unique_links], return_exceptions=True
+        )
+
+    product_details: Dict[str, List[WaitroseWineDetail]] = {}
+    for link, result in zip(unique_links, results):
+        if isinstance(result, BaseException):
+            print(f"Detail crawl failed for {link}: {result}")
+            result = []
+        product_details[link] = result
     return product_details
 
 
@@ -365,8 +824,12 @@ if __name__ == "__main__":
             print(f"ABV: {details[0].alcohol_content}")
             print(f"Rating: {details[0].rating}")
 
+        await crawler_pool.close()
+
     # Uncomment to run test
+    # import uvloop
+    # uvloop.install()
     # asyncio.run(test())
 
     # Start server
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")